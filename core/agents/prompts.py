@@ -8,6 +8,8 @@ referencing the constants directly.
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 # ---------------------------------------------------------------------------
 # Therapist
 # ---------------------------------------------------------------------------
@@ -153,27 +155,39 @@ THERAPIST_PROMPT = THERAPIST_PROMPT_EN
 CLIENT_PROMPT = CLIENT_PROMPT_EN
 DIAGNOSTICIAN_PROMPT = DIAGNOSTICIAN_PROMPT_EN
 
+# Language -> prompt tables; any language other than Spanish falls back to English
+_THERAPIST_PROMPTS = {"Español": THERAPIST_PROMPT_ES, "English": THERAPIST_PROMPT_EN}
+_CLIENT_PROMPTS = {"Español": CLIENT_PROMPT_ES, "English": CLIENT_PROMPT_EN}
+_DIAGNOSTICIAN_PROMPTS = {"Español": DIAGNOSTICIAN_PROMPT_ES, "English": DIAGNOSTICIAN_PROMPT_EN}
+_AUDITOR_PROMPTS = {"Español": AUDITOR_PROMPT_ES, "English": AUDITOR_PROMPT_EN}
+_RAPPORT_PROMPTS = {"Español": RAPPORT_PROMPT_ES, "English": RAPPORT_PROMPT_EN}
+
 
+@lru_cache(maxsize=8)
 def get_therapist_prompt(language: str = "English") -> str:
     """Returns the Therapist system prompt for the given language."""
-    return THERAPIST_PROMPT_ES if language == "Español" else THERAPIST_PROMPT_EN
+    return _THERAPIST_PROMPTS.get(language, THERAPIST_PROMPT_EN)
 
 
+@lru_cache(maxsize=8)
 def get_client_prompt(language: str = "English") -> str:
     """Returns the Client system prompt for the given language."""
-    return CLIENT_PROMPT_ES if language == "Español" else CLIENT_PROMPT_EN
+    return _CLIENT_PROMPTS.get(language, CLIENT_PROMPT_EN)
 
 
+@lru_cache(maxsize=8)
 def get_diagnostician_prompt(language: str = "English") -> str:
     """Returns the Diagnostician system prompt for the given language."""
-    return DIAGNOSTICIAN_PROMPT_ES if language == "Español" else DIAGNOSTICIAN_PROMPT_EN
+    return _DIAGNOSTICIAN_PROMPTS.get(language, DIAGNOSTICIAN_PROMPT_EN)
 
 
+@lru_cache(maxsize=8)
 def get_auditor_prompt(language: str = "English") -> str:
     """Returns the Evidence Auditor system prompt for the given language."""
-    return AUDITOR_PROMPT_ES if language == "Español" else AUDITOR_PROMPT_EN
+    return _AUDITOR_PROMPTS.get(language, AUDITOR_PROMPT_EN)
 
 
+@lru_cache(maxsize=8)
 def get_rapport_prompt(language: str = "English") -> str:
     """Returns the Rapport system prompt for the given language."""
-    return RAPPORT_PROMPT_ES if language == "Español" else RAPPORT_PROMPT_EN
+    return _RAPPORT_PROMPTS.get(language, RAPPORT_PROMPT_EN)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import random
+import sys
 
 from core.agents.base import BaseAgent
 from core.agents.prompts import get_rapport_prompt
@@ -62,20 +63,32 @@ def _resolve_patient_name(state: dict, language: str) -> tuple[str, bool]:
 class TherapistAgent(BaseAgent):
     """Explores clinical domains empathetically without diagnosing."""
 
-    # Target domains to evaluate
-    DOMAINS = [
-        "mood",
-        "anxiety",
-        "sleep",
-        "eating",
-        "substances",
-        "psychosis",
-        "trauma",
-        "ocd",
-        "cognition",
-        "social_functioning",
-        "suicidal_ideation",
-    ]
+    # Target domains to evaluate (immutable; sessions take shuffled copies).
+    # Interned so comparisons and dict lookups against them are identity hits.
+    DOMAINS: tuple[str, ...] = tuple(
+        sys.intern(d)
+        for d in (
+            "mood",
+            "anxiety",
+            "sleep",
+            "eating",
+            "substances",
+            "psychosis",
+            "trauma",
+            "ocd",
+            "cognition",
+            "social_functioning",
+            "suicidal_ideation",
+        )
+    )
+
+    def _pending_domains(self, state: dict) -> list[str]:
+        """Returns the session's pending domains, or uncovered ones when unset."""
+        pending = state.get("domains_pending")
+        if pending:
+            return pending
+        covered = frozenset(state.get("domains_covered", ()))
+        return [d for d in self.DOMAINS if d not in covered]
 
     def act(self, state: dict) -> dict:
         """Generates the next therapist question.
@@ -86,15 +99,13 @@ class TherapistAgent(BaseAgent):
         4. Update state with turn + tracking.
 
         Using ``state["domains_pending"]`` rather than recomputing from the
-        class-level ``DOMAINS`` list ensures that the domain order shuffled in
+        class-level ``DOMAINS`` tuple ensures that the domain order shuffled in
         ``init_session`` is honoured throughout the session, producing a
         different interview flow every run.
         """
         # Honour the session-level order set by init_session (may be shuffled).
         # Fall back to filtering DOMAINS only when domains_pending is absent.
-        pending = state.get("domains_pending") or [
-            d for d in self.DOMAINS if d not in state.get("domains_covered", [])
-        ]
+        pending = self._pending_domains(state)
 
         if not pending:
             state["coverage_complete"] = True
@@ -114,7 +125,7 @@ class TherapistAgent(BaseAgent):
             {
                 "role": "therapist",
                 "content": response,
-                "domain": next_domain,
+                "domain": sys.intern(next_domain),
                 "turn_id": len(state["transcript"]),
             }
         )
@@ -137,9 +148,7 @@ class TherapistAgent(BaseAgent):
             Non-empty token strings from the model, or nothing when LLM is
             unavailable (mock mode).
         """
-        pending = state.get("domains_pending") or [
-            d for d in self.DOMAINS if d not in state.get("domains_covered", [])
-        ]
+        pending = self._pending_domains(state)
         if not pending:
             return
 
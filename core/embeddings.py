@@ -0,0 +1,55 @@
+"""Process-wide accessor for the HuggingFace embedding model.
+
+Loading PubMedBERT takes several seconds of disk and CPU, and ingestion,
+diagnostics and model download all need it.  ``get_embeddings`` loads each
+(model, device) combination once per process and hands the same instance to
+every caller.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+
+def get_embeddings(
+    model_name: str,
+    device: str | None = None,
+    batch_size: int = 32,
+    normalize: bool = True,
+) -> HuggingFaceEmbeddings:
+    """Returns the shared embedding model, loading and warming it on first use.
+
+    Args:
+        model_name: HuggingFace model id, e.g. "NeuML/pubmedbert-base-embeddings".
+        device: "mps", "cuda" or "cpu"; ``None`` lets sentence-transformers pick.
+        batch_size: Encoding batch size for ``embed_documents``.
+        normalize: L2-normalise the output vectors.
+
+    Returns:
+        A ready-to-use ``HuggingFaceEmbeddings`` instance.
+    """
+    # Positional call so keyword and positional callers share one cache entry
+    return _load_embeddings(model_name, device, batch_size, normalize)
+
+
+# Room for a few (model, device) combinations, e.g. download_models (device=None)
+# and the index build (device="mps"), so they do not evict each other
+@lru_cache(maxsize=4)
+def _load_embeddings(
+    model_name: str, device: str | None, batch_size: int, normalize: bool
+) -> HuggingFaceEmbeddings:
+    """Loads and warms up an embedding model; see ``get_embeddings``."""
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device} if device else {},
+        encode_kwargs={"normalize_embeddings": normalize, "batch_size": batch_size},
+    )
+    # Dummy forward pass so the first real query does not pay warm-up cost
+    embeddings.embed_query("warmup")
+    return embeddings
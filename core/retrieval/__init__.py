@@ -1,10 +1,13 @@
 """RAG retrieval pipeline initialization."""
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 from langchain_core.embeddings import Embeddings
 
 from core.retrieval.query_builder import QueryBuilder
-from core.retrieval.retrievers import HybridRetriever
+from core.retrieval.retrievers import BM25_VOCAB_FILE, HybridRetriever, load_faiss_index
 
 __all__ = ["QueryBuilder", "HybridRetriever", "init_rag_pipeline"]
 
@@ -35,6 +38,42 @@ class SimpleEmbeddings(Embeddings):
         return result[0]
 
 
+class CachedQueryEmbeddings(Embeddings):
+    """Wraps an ``Embeddings`` model with an LRU cache on ``embed_query``.
+
+    The embedding forward pass dominates ``HybridRetriever.retrieve`` and eval
+    sweeps issue the same queries many times, so repeated queries are served
+    from memory.  Document embedding is passed through untouched.
+    """
+
+    def __init__(self, base: Embeddings, maxsize: int = 1024) -> None:
+        self.base = base
+        self.maxsize = maxsize
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        # retrieve_context dispatches queries from a thread pool
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Returns the cached embedding for *text*, computing it on a miss."""
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return list(cached)
+
+        vector = self.base.embed_query(text)
+
+        with self._lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return list(vector)
+
+
 def init_rag_pipeline():
     """Lazily initializes the RAG pipeline (Chroma vectorstore + HybridRetriever)."""
     global _rag_pipeline
@@ -66,26 +105,48 @@ def init_rag_pipeline():
             collection_name = "icd11_es"
 
         # Load the pre-built Chroma vectorstore with lightweight embeddings
-        embeddings = SimpleEmbeddings()
+        embeddings = CachedQueryEmbeddings(SimpleEmbeddings())
         vectorstore = Chroma(
             persist_directory=str(chroma_path),
             embedding_function=embeddings,
             collection_name=collection_name,
         )
 
-        # Initialize HybridRetriever with mock BM25 corpus
-        bm25_corpus = [
-            {
-                "content": "Depressive Episode - ICD-11 6A70: A depressive episode is characterized by persistent low mood and loss of interest in activities.",
-                "metadata": {"code": "6A70"},
-            },
-            {
-                "content": "Anxiety Disorder - ICD-11 6A80: Anxiety is excessive worry and fear that interferes with daily functioning.",
-                "metadata": {"code": "6A80"},
-            },
-        ]
-
-        retriever = HybridRetriever(vectorstore, bm25_corpus)
+        # Optional FAISS mirror built inside the Chroma directory.  Its vectors
+        # come from the ingest model, so queries are embedded with that model
+        faiss_index = faiss_docs = faiss_embeddings = None
+        faiss_mirror = load_faiss_index(chroma_path / "faiss")
+        if faiss_mirror is not None:
+            from core.embeddings import get_embeddings
+
+            try:
+                faiss_embeddings = CachedQueryEmbeddings(get_embeddings(faiss_mirror[2]))
+                faiss_index, faiss_docs = faiss_mirror[:2]
+            except Exception as e:
+                print(f"⚠️ FAISS query model unavailable ({e}); dense search uses Chroma.")
+        faiss_kwargs = {
+            "faiss_index": faiss_index,
+            "faiss_docs": faiss_docs,
+            "faiss_embeddings": faiss_embeddings,
+        }
+
+        bm25_path = chroma_path / "bm25"
+        if (bm25_path / BM25_VOCAB_FILE).exists():
+            # Memory-map the BM25 state written at ingest time
+            retriever = HybridRetriever.load(bm25_path, vectorstore, **faiss_kwargs)
+        else:
+            # Initialize HybridRetriever with mock BM25 corpus
+            bm25_corpus = [
+                {
+                    "content": "Depressive Episode - ICD-11 6A70: A depressive episode is characterized by persistent low mood and loss of interest in activities.",
+                    "metadata": {"code": "6A70"},
+                },
+                {
+                    "content": "Anxiety Disorder - ICD-11 6A80: Anxiety is excessive worry and fear that interferes with daily functioning.",
+                    "metadata": {"code": "6A80"},
+                },
+            ]
+            retriever = HybridRetriever(vectorstore, bm25_corpus, **faiss_kwargs)
         _rag_pipeline = {
             "vectorstore": vectorstore,
             "retriever": retriever,
@@ -1,11 +1,149 @@
 """Retrievers: dense (Chroma) + lexical (BM25) with fusion."""
 
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
 from langchain_chroma import Chroma
-from rank_bm25 import BM25Okapi
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from scipy.sparse import csr_matrix
+
+# Okapi BM25 parameters (same defaults as rank_bm25.BM25Okapi)
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+_BM25_EPSILON = 0.25
+
+# Files of the optional FAISS mirror written by knowledge.indexing.chroma_builder
+FAISS_INDEX_FILE = "index.faiss"
+FAISS_DOCS_FILE = "docs.json"
+FAISS_META_FILE = "meta.json"
+
+# Files written by HybridRetriever.save: one .npy per array plus the corpus
+_BM25_ARRAYS = ("idf", "doc_len", "indptr", "indices", "data")
+BM25_VOCAB_FILE = "vocab.npy"
+BM25_DOCS_FILE = "docs.json"
+BM25_META_FILE = "meta.json"
+
+# Stamped into BM25_META_FILE; bump whenever the tokenizer or the array layout
+# changes so that indexes written by older code are rebuilt instead of reused.
+#   1: whitespace split + lower()
+#   2: \w+ tokens + casefold() (punctuation dropped)
+BM25_FORMAT_VERSION = 2
+
+
+# Word tokens for BM25; punctuation is dropped so "ansiedad," matches "ansiedad"
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4096)
+def _tokenize(text: str) -> tuple[str, ...]:
+    """Case-folds *text* and splits it into word tokens for BM25 scoring.
+
+    Used for queries.  Cached because eval sweeps replay the same question
+    banks across many profiles, so identical queries are tokenized over and
+    over.  Corpus documents are tokenized once at index time, bypassing the
+    cache.
+    """
+    return tuple(_TOKEN_RE.findall(text.casefold()))
+
+
+class BM25Index(NamedTuple):
+    """Precomputed BM25 state: per-(term, doc) scores plus the term lookup."""
+
+    matrix: csr_matrix
+    vocab: dict[str, int]
+    idf: np.ndarray
+    doc_len: np.ndarray
+
+
+def _build_bm25_matrix(tokenized_corpus: list[tuple[str, ...]]) -> BM25Index:
+    """Precomputes Okapi BM25 term scores as a sparse (terms x docs) matrix.
+
+    Each stored entry is the full per-(term, doc) contribution::
+
+        idf[t] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(d) / avgdl))
+
+    so scoring a query reduces to summing the rows of its terms.  IDF values
+    follow ``rank_bm25.BM25Okapi``: negative IDFs are floored to
+    ``epsilon * average_idf``.
+
+    Returns:
+        A ``BM25Index`` whose ``vocab`` maps each term to its row in
+        ``matrix``.
+    """
+    vocab: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    tfs: list[int] = []
+    for doc_idx, tokens in enumerate(tokenized_corpus):
+        for term, tf in Counter(tokens).items():
+            rows.append(vocab.setdefault(term, len(vocab)))
+            cols.append(doc_idx)
+            tfs.append(tf)
+
+    n_docs = len(tokenized_corpus)
+    doc_len = np.fromiter((len(t) for t in tokenized_corpus), dtype=np.float64, count=n_docs)
+    row_ids = np.asarray(rows, dtype=np.int64)
+    col_ids = np.asarray(cols, dtype=np.int64)
+    tf_arr = np.asarray(tfs, dtype=np.float64)
+
+    doc_freq = np.bincount(row_ids, minlength=len(vocab)).astype(np.float64)
+    idf = np.log(n_docs - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+    if idf.size:
+        idf[idf < 0] = _BM25_EPSILON * idf.mean()
+
+    avgdl = doc_len.sum() / n_docs if n_docs else 0.0
+    data = np.empty(0, dtype=np.float64)
+    if tf_arr.size:
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc_len[col_ids] / avgdl)
+        data = idf[row_ids] * tf_arr * (_BM25_K1 + 1) / (tf_arr + norm)
+
+    score_matrix = csr_matrix((data, (row_ids, col_ids)), shape=(len(vocab), n_docs))
+    return BM25Index(score_matrix, vocab, idf, doc_len)
+
+
+def load_faiss_index(faiss_dir: str | Path) -> tuple[object, list[Document], str] | None:
+    """Loads the FAISS mirror of the dense index, if present.
+
+    Returns:
+        ``(index, docs, embedding_model)`` where ``docs[i]`` is the Document
+        stored at row ``i`` of the index and ``embedding_model`` is the model
+        that produced its vectors, or ``None`` when ``faiss`` is not installed
+        or the index files are missing.
+    """
+    paths = [
+        Path(faiss_dir) / name for name in (FAISS_INDEX_FILE, FAISS_DOCS_FILE, FAISS_META_FILE)
+    ]
+    if not all(path.exists() for path in paths):
+        return None
+    try:
+        import faiss
+    except ImportError:
+        return None
+
+    index_path, docs_path, meta_path = paths
+    with open(docs_path, encoding="utf-8") as fh:
+        raw_docs = json.load(fh)
+    with open(meta_path, encoding="utf-8") as fh:
+        embedding_model = json.load(fh)["embedding_model"]
+    docs = [Document(page_content=d["content"], metadata=d.get("metadata") or {}) for d in raw_docs]
+    return faiss.read_index(str(index_path)), docs, embedding_model
 
 
 class HybridRetriever:
-    """Combines dense retrieval (Chroma) + BM25 with Reciprocal Rank Fusion."""
+    """Combines dense retrieval (Chroma) + BM25 with Reciprocal Rank Fusion.
+
+    When a FAISS index (see ``load_faiss_index``) is supplied together with
+    the embedding model that built it, unfiltered dense queries are answered
+    from it directly and Chroma is only used for metadata-filtered searches.
+    """
 
     def __init__(
         self,
@@ -14,16 +152,132 @@ class HybridRetriever:
         top_k_dense: int = 8,
         top_k_bm25: int = 8,
         top_k_final: int = 6,
+        faiss_index: object | None = None,
+        faiss_docs: list[Document] | None = None,
+        faiss_embeddings: Embeddings | None = None,
+        bm25_index: BM25Index | None = None,
     ):
+        """Builds the retriever.
+
+        Args:
+            vectorstore: Chroma vectorstore for the dense side.
+            bm25_corpus: ``{content, metadata}`` dicts indexed by BM25.
+            top_k_dense: Candidates taken from dense search.
+            top_k_bm25: Candidates taken from BM25.
+            top_k_final: Chunks returned after fusion.
+            faiss_index: Optional FAISS mirror of the dense index.
+            faiss_docs: Document stored at each row of ``faiss_index``.
+            faiss_embeddings: Model that built ``faiss_index``, used to embed
+                queries for it.
+            bm25_index: Precomputed BM25 state for ``bm25_corpus`` (see
+                ``load``); built from the corpus when omitted.
+        """
         self.vectorstore = vectorstore
+        self.faiss_index = faiss_index
+        self.faiss_docs = faiss_docs or []
+        self.faiss_embeddings = faiss_embeddings
         self.top_k_dense = top_k_dense
         self.top_k_bm25 = top_k_bm25
         self.top_k_final = top_k_final
-        # Build BM25 index
-        tokenized = [doc["content"].lower().split() for doc in bm25_corpus]
-        self.bm25 = BM25Okapi(tokenized)
+        if bm25_index is None:
+            tokenized = [tuple(_TOKEN_RE.findall(d["content"].casefold())) for d in bm25_corpus]
+            bm25_index = _build_bm25_matrix(tokenized)
+        self._bm25_matrix, self._bm25_vocab, self._bm25_idf, self._bm25_doc_len = bm25_index
         self.bm25_docs = bm25_corpus
 
+    def save(self, path: str | Path) -> None:
+        """Writes the precomputed BM25 state to the directory *path*.
+
+        Each array is stored as a raw ``.npy`` file so that ``load`` can
+        memory-map it: worker processes then share the same page-cache pages
+        instead of re-tokenizing the corpus on start-up.
+        """
+        out_dir = Path(path)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        matrix = self._bm25_matrix
+        arrays = {
+            "idf": self._bm25_idf,
+            "doc_len": self._bm25_doc_len,
+            "indptr": matrix.indptr,
+            "indices": matrix.indices,
+            "data": matrix.data,
+        }
+        for name in _BM25_ARRAYS:
+            np.save(out_dir / f"{name}.npy", arrays[name])
+
+        terms = sorted(self._bm25_vocab, key=self._bm25_vocab.__getitem__)
+        np.save(out_dir / BM25_VOCAB_FILE, np.array(terms, dtype=str))
+        with open(out_dir / BM25_DOCS_FILE, "w", encoding="utf-8") as fh:
+            json.dump(self.bm25_docs, fh, ensure_ascii=False)
+        with open(out_dir / BM25_META_FILE, "w", encoding="utf-8") as fh:
+            json.dump({"format_version": BM25_FORMAT_VERSION}, fh)
+
+    @classmethod
+    def load(cls, path: str | Path, vectorstore: Chroma, **kwargs) -> HybridRetriever:
+        """Restores a retriever written by ``save`` without rebuilding BM25.
+
+        Indexes stamped with another ``BM25_FORMAT_VERSION`` (or none, i.e.
+        written before the stamp existed) are rebuilt from the saved corpus,
+        as their terms may not match the current tokenizer.
+
+        Args:
+            path: Directory previously passed to ``save``.
+            vectorstore: Chroma vectorstore for the dense side.
+            **kwargs: Forwarded to ``__init__`` (``top_k_*``, FAISS index…).
+        """
+        in_dir = Path(path)
+        with open(in_dir / BM25_DOCS_FILE, encoding="utf-8") as fh:
+            bm25_docs = json.load(fh)
+
+        try:
+            with open(in_dir / BM25_META_FILE, encoding="utf-8") as fh:
+                version = json.load(fh).get("format_version")
+        except FileNotFoundError:
+            version = None
+        if version != BM25_FORMAT_VERSION:
+            print(
+                f"⚠️ BM25 index at {in_dir} is outdated; rebuilding it (re-run ingest to persist)."
+            )
+            return cls(vectorstore, bm25_docs, **kwargs)
+
+        arrays = {name: np.load(in_dir / f"{name}.npy", mmap_mode="r") for name in _BM25_ARRAYS}
+        terms = np.load(in_dir / BM25_VOCAB_FILE)
+        matrix = csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=(len(terms), len(arrays["doc_len"])),
+            copy=False,
+        )
+        bm25_index = BM25Index(
+            matrix, {str(term): i for i, term in enumerate(terms)}, arrays["idf"], arrays["doc_len"]
+        )
+        return cls(vectorstore, bm25_docs, bm25_index=bm25_index, **kwargs)
+
+    def _dense_search(self, query: str, filter_metadata: dict | None) -> list:
+        """Returns dense ``(Document, score)`` pairs, via FAISS when possible."""
+        index = self.faiss_index
+        if index is not None and self.faiss_embeddings is not None and filter_metadata is None:
+            # Queries must be embedded by the model that built the index
+            q_emb = np.asarray([self.faiss_embeddings.embed_query(query)], dtype=np.float32)
+            scores, ids = index.search(q_emb, self.top_k_dense)  # type: ignore[attr-defined]
+            docs = self.faiss_docs
+            return [
+                (docs[i], float(score))
+                for score, i in zip(scores[0], ids[0], strict=True)
+                if i >= 0
+            ]
+
+        return self.vectorstore.similarity_search_with_score(
+            query, k=self.top_k_dense, filter=filter_metadata
+        )
+
+    def _bm25_scores(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every corpus document for *query*."""
+        vocab = self._bm25_vocab
+        term_ids = [vocab[t] for t in _tokenize(query) if t in vocab]
+        if not term_ids:
+            return np.zeros(self._bm25_matrix.shape[1])
+        return np.asarray(self._bm25_matrix[term_ids].sum(axis=0)).ravel()
+
     def _rrf_fusion(self, dense_results: list, bm25_top: list) -> list[dict]:
         """Merges dense and BM25 ranked lists via Reciprocal Rank Fusion.
 
@@ -43,52 +297,57 @@ class HybridRetriever:
             score descending, each as ``{content, metadata, score, source}``.
         """
         K = 60  # Standard RRF smoothing constant
-        scores: dict[str, float] = {}
-        docs: dict[str, dict] = {}
+        # Candidate slot per distinct content, in first-seen order
+        slots: dict[str, int] = {}
+        docs: list[dict] = []
+        bm25_docs = self.bm25_docs
+        n_bm25_docs = len(bm25_docs)
 
-        # Contribution from dense retrieval
-        for rank, (doc, _similarity) in enumerate(dense_results):
+        dense_slots: list[int] = []
+        for doc, _similarity in dense_results:
             key = doc.page_content
-            scores[key] = scores.get(key, 0.0) + 1.0 / (K + rank + 1)
-            if key not in docs:
-                docs[key] = {
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "source": "dense",
-                }
-
-        # Contribution from BM25 retrieval
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(docs)
+                docs.append({"content": key, "metadata": doc.metadata, "source": "dense"})
+            dense_slots.append(slot)
+
+        bm25_slots: list[int] = []
+        bm25_ranks: list[int] = []
         for rank, (corpus_idx, _bm25_score) in enumerate(bm25_top):
-            if corpus_idx >= len(self.bm25_docs):
+            if corpus_idx >= n_bm25_docs:
                 continue
-            bm25_doc = self.bm25_docs[corpus_idx]
+            bm25_doc = bm25_docs[corpus_idx]
             key = bm25_doc["content"]
-            scores[key] = scores.get(key, 0.0) + 1.0 / (K + rank + 1)
-            if key not in docs:
-                docs[key] = {
-                    "content": bm25_doc["content"],
-                    "metadata": bm25_doc.get("metadata", {}),
-                    "source": "bm25",
-                }
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(docs)
+                docs.append(
+                    {"content": key, "metadata": bm25_doc.get("metadata", {}), "source": "bm25"}
+                )
             else:
                 # Document appeared in both lists
-                docs[key]["source"] = "hybrid"
-
-        # Sort by fused RRF score and attach score to each result
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+                docs[slot]["source"] = "hybrid"
+            bm25_slots.append(slot)
+            bm25_ranks.append(rank)
 
-        # Prioritise chunks that contain an explicit ICD-11 code
-        def _priority(item: tuple[str, float]) -> tuple[int, float]:
-            key, score = item
-            has_code = bool(docs[key].get("metadata", {}).get("code"))
-            return (0 if has_code else 1, -score)
+        # Sum 1/(k + rank) per candidate (1-based ranks); add.at accumulates
+        # repeated slots.  Skipped BM25 entries still consume their rank.
+        scores = np.zeros(len(docs))
+        np.add.at(scores, dense_slots, 1.0 / (K + 1 + np.arange(len(dense_slots))))
+        np.add.at(scores, bm25_slots, 1.0 / (K + 1 + np.asarray(bm25_ranks, dtype=np.float64)))
 
-        ranked.sort(key=_priority)
+        # Chunks with an explicit ICD-11 code first, then by fused score;
+        # lexsort is stable, so ties keep first-seen order
+        no_code = np.fromiter(
+            (not d.get("metadata", {}).get("code") for d in docs), dtype=bool, count=len(docs)
+        )
+        order = np.lexsort((-scores, no_code))[: self.top_k_final]
 
         result = []
-        for key, score in ranked[: self.top_k_final]:
-            entry = dict(docs[key])
-            entry["score"] = round(score, 6)
+        for slot in order:
+            entry = dict(docs[slot])
+            entry["score"] = round(float(scores[slot]), 6)
             result.append(entry)
 
         return result
@@ -96,21 +355,17 @@ class HybridRetriever:
     def retrieve(self, query: str, filter_metadata: dict | None = None) -> list[dict]:
         """Executes hybrid retrieval.
 
-        1. Dense search on Chroma
+        1. Dense search (FAISS mirror if loaded, else Chroma)
         2. BM25 search
         3. Reciprocal Rank Fusion
         4. Dedup + prioritize chunks with code/uri
         """
         # Dense
-        dense_results = self.vectorstore.similarity_search_with_score(
-            query, k=self.top_k_dense, filter=filter_metadata
-        )
+        dense_results = self._dense_search(query, filter_metadata)
         # BM25
-        tokenized_query = query.lower().split()
-        bm25_scores = self.bm25.get_scores(tokenized_query)
-        bm25_top = sorted(enumerate(bm25_scores), key=lambda x: x[1], reverse=True)[
-            : self.top_k_bm25
-        ]
+        bm25_scores = self._bm25_scores(query)
+        top_idx = np.argsort(-bm25_scores, kind="stable")[: self.top_k_bm25]
+        bm25_top = [(int(i), float(bm25_scores[i])) for i in top_idx]
 
         # Fusion (Reciprocal Rank Fusion, k=60)
         return self._rrf_fusion(dense_results, bm25_top)
@@ -1,19 +1,26 @@
 """Detects sensitive content and gracefully stops the session."""
 
 import re
+from functools import lru_cache
 
-# Keywords triggering the RiskGate (Spanish and English)
-RISK_KEYWORDS = [
-    r"suicid",
-    r"matarme",
-    r"quitarme la vida",
-    r"autolesion",
-    r"hacerme daño",
-    r"no quiero vivir",
-    r"cortarme",
-    r"self\.harm",
-    r"kill myself",
-]
+# Risk type labels, shown in Spanish in the user conversational interface
+_SELF_HARM = "Riesgo de Autolesión o Suicidio"
+
+# Keyword phrase -> risk type. Phrases (Spanish and English) are lowercase and
+# matched literally and case-insensitively anywhere in the text
+RISK_PATTERNS: dict[str, str] = {
+    "suicid": _SELF_HARM,
+    "matarme": _SELF_HARM,
+    "quitarme la vida": _SELF_HARM,
+    "autolesion": _SELF_HARM,
+    "hacerme daño": _SELF_HARM,
+    "no quiero vivir": _SELF_HARM,
+    "cortarme": _SELF_HARM,
+    "self.harm": _SELF_HARM,
+    "kill myself": _SELF_HARM,
+}
+
+RISK_KEYWORDS = list(RISK_PATTERNS)
 
 # Educational system Spanish disclaimer string response
 SAFE_RESPONSE_TEMPLATE = """
@@ -30,20 +37,59 @@ Esta sesión se ha pausado por seguridad.
 """
 
 
+@lru_cache(maxsize=1)
+def _keyword_automaton():
+    """Builds an Aho-Corasick automaton over ``RISK_PATTERNS``.
+
+    Returns:
+        A ``pyahocorasick`` automaton whose values are the keywords' risk types,
+        or ``None`` when the optional ``pyahocorasick`` package is missing.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword, risk_type in RISK_PATTERNS.items():
+        automaton.add_word(keyword.casefold(), risk_type)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=16)
+def _safe_response(risk_type: str) -> str:
+    """Formats the disclaimer once per risk type."""
+    return SAFE_RESPONSE_TEMPLATE.format(risk_type=risk_type)
+
+
 class RiskGate:
     """Intercepts sensitive content across all graph nodes."""
 
-    def _classify_risk(self, pattern: str) -> str:
-        # Default translation returned in Spanish for user conversational interface
-        return "Riesgo de Autolesión o Suicidio"
+    # Single case-insensitive alternation used when pyahocorasick is missing,
+    # with one group per keyword so a match maps back to its risk type by index
+    _PATTERN = re.compile("|".join(f"({re.escape(k)})" for k in RISK_PATTERNS), re.IGNORECASE)
+    _RISK_TYPES = tuple(RISK_PATTERNS.values())
 
     def check(self, text: str) -> tuple[bool, str | None]:
         """Returns (is_risky, risk_type) if sensitive content is detected."""
-        for pattern in RISK_KEYWORDS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True, self._classify_risk(pattern)
-        return False, None
+        automaton = _keyword_automaton()
+        if automaton is not None:
+            # One pass over the text, independent of the number of keywords.
+            # casefold (not lower) so variants such as "ſ" still match, as
+            # they do under the fallback's re.IGNORECASE
+            hit = next(automaton.iter(text.casefold()), None)
+            if hit is None:
+                return False, None
+            return True, hit[1]
+
+        match = self._PATTERN.search(text)
+        if match is None:
+            return False, None
+        # IGNORECASE also matches Unicode case variants (e.g. "ſ" for "s")
+        # that no string normalisation maps back, so look up by group index
+        return True, self._RISK_TYPES[match.lastindex - 1]
 
     def get_safe_response(self, risk_type: str) -> str:
         """Returns a generic disclaimer and halts the response generation."""
-        return SAFE_RESPONSE_TEMPLATE.format(risk_type=risk_type)
+        return _safe_response(risk_type)
@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from langchain.schema import Document
 from langchain_chroma import Chroma
 
+from core.retrieval.retrievers import (
+    FAISS_DOCS_FILE,
+    FAISS_INDEX_FILE,
+    FAISS_META_FILE,
+    HybridRetriever,
+)
+
 COLLECTION_NAME = "icd11_es"
 PERSIST_DIR = "data/indexes/chroma"
 
+# HNSW tuning for the collection.  Embeddings are L2-normalised, so cosine is
+# the natural space; M=32 / construction_ef=200 raise recall over Chroma's
+# defaults while search_ef=64 keeps query latency low.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
 
 def build_chroma_index(
     chunks: list[dict],
@@ -33,14 +51,10 @@ def build_chroma_index(
     _persist = str(persist_dir) if persist_dir is not None else PERSIST_DIR
     _collection = collection_name if collection_name is not None else COLLECTION_NAME
 
-    # Initialize embeddings
-    from langchain_community.embeddings import HuggingFaceEmbeddings
+    # Shared, process-wide embedding model
+    from core.embeddings import get_embeddings
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name=embedding_model_name,
-        model_kwargs={"device": device},
-        encode_kwargs={"normalize_embeddings": True, "batch_size": 32},
-    )
+    embeddings = get_embeddings(embedding_model_name, device)
 
     # Create LangChain documents
     documents = [Document(page_content=c["content"], metadata=c["metadata"] or {}) for c in chunks]
@@ -51,9 +65,73 @@ def build_chroma_index(
         embedding=embeddings,
         collection_name=_collection,
         persist_directory=_persist,
+        collection_metadata=HNSW_METADATA,
     )
+
+    # Optional FAISS mirror inside the Chroma directory (requires faiss-cpu)
+    build_faiss_index(vectorstore, Path(_persist) / "faiss", embedding_model_name)
+
+    # Precomputed BM25 arrays, memory-mapped by init_rag_pipeline at start-up
+    bm25_corpus = [{"content": c["content"], "metadata": c["metadata"] or {}} for c in chunks]
+    HybridRetriever(vectorstore, bm25_corpus).save(Path(_persist) / "bm25")
     return vectorstore
 
 
+def build_faiss_index(
+    vectorstore: Chroma, faiss_dir: str | Path, embedding_model_name: str
+) -> Path | None:
+    """Mirrors the Chroma collection into a FAISS HNSW index.
+
+    Reuses the embeddings already stored in Chroma (no second forward pass)
+    and writes the index plus JSON sidecars with each row's content and
+    metadata and the embedding model name, so ``HybridRetriever`` can embed
+    queries with the same model and answer dense queries from FAISS without
+    going through Chroma.
+
+    Args:
+        vectorstore: Populated Chroma vectorstore.
+        faiss_dir: Directory receiving ``index.faiss``, ``docs.json`` and
+            ``meta.json``.
+        embedding_model_name: Model that produced the stored embeddings.
+
+    Returns:
+        Path of the written index, or ``None`` when ``faiss`` is not
+        installed or the collection is empty.
+    """
+    try:
+        import faiss
+    except ImportError:
+        print("  ⚠️  faiss not installed — skipping FAISS index.")
+        return None
+
+    import numpy as np
+
+    data = vectorstore.get(include=["embeddings", "documents", "metadatas"])
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    if vectors.size == 0:
+        return None
+
+    # Embeddings are L2-normalised, so inner product == cosine similarity
+    index = faiss.IndexHNSWFlat(vectors.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 200
+    index.add(vectors)
+
+    out_dir = Path(faiss_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_path = out_dir / FAISS_INDEX_FILE
+    faiss.write_index(index, str(index_path))
+
+    docs = [
+        {"content": content, "metadata": metadata or {}}
+        for content, metadata in zip(data["documents"], data["metadatas"], strict=True)
+    ]
+    with open(out_dir / FAISS_DOCS_FILE, "w", encoding="utf-8") as fh:
+        json.dump(docs, fh, ensure_ascii=False)
+    with open(out_dir / FAISS_META_FILE, "w", encoding="utf-8") as fh:
+        json.dump({"embedding_model": embedding_model_name}, fh)
+
+    return index_path
+
+
 # Backward-compatible alias
 build_index = build_chroma_index
@@ -16,10 +16,15 @@ import subprocess
 import sys
 from datetime import UTC
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
+import orjson
 import yaml
 
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
+
 
 def _load_config(config_path: str) -> dict:
     with open(config_path) as fh:
@@ -84,34 +89,38 @@ def ingest(pdf: str, config: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-@cli.command()
-@click.option("--profile", required=True, type=click.Path(exists=True), help="Client profile JSON.")
-@click.option("--config", default="configs/app.yaml", show_default=True, help="Config file.")
-@click.option("--language", default=None, help="Override language ('Español' or 'English').")
-@click.option("--seed", default=42, show_default=True, type=int, help="Random seed.")
-def run(profile: str, config: str, language: str | None, seed: int) -> None:
-    """Executes a full automated session and writes the result to runs/."""
+def _execute_profile(
+    profile_path: str,
+    cfg: dict,
+    language: str | None,
+    seed: int,
+    graph: CompiledStateGraph,
+) -> Path:
+    """Runs one automated session on a pre-built graph and writes it to runs/.
+
+    The graph (and the process-wide RAG pipeline it uses) is built once by the
+    caller so that ``eval`` can run many profiles without reloading models.
+
+    Returns:
+        Path of the written session JSON.
+    """
     import random
+    import uuid
+    from datetime import datetime
 
-    random.seed(seed)
+    from core.orchestration.state import SessionState
 
-    cfg = _load_config(config)
+    random.seed(seed)
 
-    with open(profile) as fh:
+    with open(profile_path) as fh:
         client_profile: dict = json.load(fh)
 
     session_language = language or client_profile.get("language", "Español")
 
     click.echo("Starting session")
-    click.echo(f"  Profile  : {profile}")
+    click.echo(f"  Profile  : {profile_path}")
     click.echo(f"  Language : {session_language}")
 
-    import uuid
-    from datetime import datetime
-
-    from core.orchestration.graph import build_graph
-    from core.orchestration.state import SessionState
-
     session_id = f"sess_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
 
     initial_state: SessionState = {
@@ -139,30 +148,41 @@ def run(profile: str, config: str, language: str | None, seed: int) -> None:
         "language": session_language,
     }
 
-    graph = build_graph()
     final_state = graph.invoke(initial_state)
 
     # Persist output
     runs_dir = Path("runs")
     runs_dir.mkdir(exist_ok=True)
     output_path = runs_dir / f"{session_id}.json"
-    with open(output_path, "w") as fh:
-        json.dump(
-            {
-                "session_id": session_id,
-                "hypotheses": final_state.get("hypotheses", []),
-                "audit_report": final_state.get("audit_report"),
-                "transcript": final_state.get("transcript", []),
-                "coverage": {
-                    "domains_covered": final_state.get("domains_covered", []),
-                    "domains_pending": final_state.get("domains_pending", []),
-                },
-                "risk_detected": final_state.get("risk_detected", False),
-            },
-            fh,
-            indent=2,
-            ensure_ascii=False,
-        )
+    payload = {
+        "session_id": session_id,
+        "hypotheses": final_state.get("hypotheses", []),
+        "audit_report": final_state.get("audit_report"),
+        "transcript": final_state.get("transcript", []),
+        "coverage": {
+            "domains_covered": final_state.get("domains_covered", []),
+            "domains_pending": final_state.get("domains_pending", []),
+        },
+        "risk_detected": final_state.get("risk_detected", False),
+    }
+    # orjson encodes straight to UTF-8 bytes (no ensure_ascii escaping needed)
+    with open(output_path, "wb") as fh:
+        fh.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+    return output_path
+
+
+@cli.command()
+@click.option("--profile", required=True, type=click.Path(exists=True), help="Client profile JSON.")
+@click.option("--config", default="configs/app.yaml", show_default=True, help="Config file.")
+@click.option("--language", default=None, help="Override language ('Español' or 'English').")
+@click.option("--seed", default=42, show_default=True, type=int, help="Random seed.")
+def run(profile: str, config: str, language: str | None, seed: int) -> None:
+    """Executes a full automated session and writes the result to runs/."""
+    from core.orchestration.graph import build_graph
+
+    cfg = _load_config(config)
+    output_path = _execute_profile(profile, cfg, language, seed, build_graph())
 
     click.echo(f"  ✓ Session complete. Output: {output_path}")
 
@@ -233,19 +253,27 @@ def eval(suite: str, config: str, output: str) -> None:
     click.echo(f"Evaluation suite: {suite}")
     click.echo(f"  Profiles: {len(profiles)}")
 
+    from core.orchestration.graph import build_graph
+
+    cfg = _load_config(config)
+    # Build the graph once and reuse it for every profile
+    graph = build_graph()
+
     results = []
     for profile_path in profiles:
         click.echo(f"  Running profile: {profile_path} …")
-        from click.testing import CliRunner
-
-        runner = CliRunner()
-        result = runner.invoke(run, ["--profile", profile_path, "--config", config])
-        results.append({"profile": profile_path, "exit_code": result.exit_code})
+        try:
+            _execute_profile(profile_path, cfg, None, 42, graph)
+            exit_code = 0
+        except Exception as exc:
+            click.echo(f"  ✗ Profile failed: {exc}")
+            exit_code = 1
+        results.append({"profile": profile_path, "exit_code": exit_code})
 
     output_path = Path(output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as fh:
-        json.dump({"suite": suite, "results": results}, fh, indent=2)
+    with open(output_path, "wb") as fh:
+        fh.write(orjson.dumps({"suite": suite, "results": results}, option=orjson.OPT_INDENT_2))
 
     click.echo(f"  ✓ Evaluation complete. Report: {output_path}")
 
@@ -47,15 +47,21 @@ def check_chroma_status():
     # 3. Try to load Chroma
     print("\n3️⃣ Chroma Load Test:")
     try:
+        import chromadb
+        from chromadb.config import Settings
         from langchain_chroma import Chroma
-        from langchain_huggingface import HuggingFaceEmbeddings
+
+        from core.embeddings import get_embeddings
 
         if CHROMA_PATH.exists() and any(CHROMA_PATH.glob("*")):
-            embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/PubMedBERT-base-uncased-abstract"
+            embeddings = get_embeddings("sentence-transformers/PubMedBERT-base-uncased-abstract")
+            # Persistent client opens the on-disk segments directly
+            client = chromadb.PersistentClient(
+                path=str(CHROMA_PATH),
+                settings=Settings(allow_reset=False, anonymized_telemetry=False),
             )
             vectorstore = Chroma(
-                persist_directory=str(CHROMA_PATH),
+                client=client,
                 embedding_function=embeddings,
                 collection_name="icd11",
             )
@@ -72,7 +78,7 @@ def check_chroma_status():
 
     except ImportError as e:
         print(f"   Status: ❌ Import error - {e}")
-        print("   Run: pip install langchain langchain-chroma langchain-huggingface")
+        print("   Run: pip install langchain-community langchain-chroma sentence-transformers")
     except Exception as e:
         print(f"   Status: ⚠️  {e}")
 
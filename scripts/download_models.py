@@ -8,9 +8,15 @@ or directly:
 
 from __future__ import annotations
 
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import yaml
 from huggingface_hub import hf_hub_download
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 def _load_config(config_path: str = "configs/app.yaml") -> dict:
@@ -46,17 +52,26 @@ def download_embeddings(config: dict | None = None) -> SentenceTransformer:
     Returns:
         Loaded ``SentenceTransformer`` instance.
     """
+    from core.embeddings import get_embeddings
+
     cfg = config or _load_config()
     model_name: str = cfg["embeddings"]["model_name"]
 
     print(f"Downloading embeddings: {model_name}")
-    model = SentenceTransformer(model_name)
+    # Loads through the shared accessor so later commands reuse the instance
+    model: SentenceTransformer = get_embeddings(model_name).client
     dim = model.get_sentence_embedding_dimension()
     print(f"  ✓ Embeddings loaded: {dim} dimensions")
     return model
 
 
 if __name__ == "__main__":
+    # Run as a file, only scripts/ is on sys.path; add the repo root so the
+    # lazy ``core`` import resolves without an editable install
+    _root = str(Path(__file__).resolve().parent.parent)
+    if _root not in sys.path:
+        sys.path.insert(0, _root)
+
     config = _load_config()
     download_llm(config)
     download_embeddings(config)
@@ -1,32 +1,93 @@
 #!/usr/bin/env python
 """Validation script for the complete RAG pipeline."""
 
+import os
+import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+_RULE = "=" * 70
+
+_BANNER = f"\n{_RULE}\n📊 RAG PIPELINE VALIDATION\n{_RULE}\n"
+
+_SUMMARY = f"""
+{_RULE}
+PIPELINE READY FOR TESTING
+{_RULE}
+
+✅ Status: All components initialized
+   
+To launch the UI:
+   cd /Users/ketcx/pinguino_project/rag-project
+   streamlit run apps/ui/app.py
+
+Workflow:
+   1. Choose language (Español/English)
+   2. Choose mode (Interactive/Auto)
+   3. Start interview
+   4. System will:
+      • Ask therapeutic questions
+      • Monitor for safety risks
+      • Retrieve ICD-11 context via RAG
+      • Generate diagnostic hypotheses
+      • Audit evidence and finalize
+    
+Known limitations:
+   ⚠️  RAG retrieval uses mock fallback (TF-IDF lightweight)
+   ⚠️  Only 30 PDF pages indexed (for speed)
+   ⚠️  DiagnosticianAgent may return hardcoded output if RAG fails
+   
+To index full PDF:
+   python scripts/ingest_pdf_lite.py
+
+To diagnose:
+   python scripts/diagnose_chroma.py
+
+{_RULE}
+"""
+
+
+_GRAPH = None
+_GRAPH_LOCK = threading.Lock()
+
 
 def validate_ingestion():
     """Check PDF ingestion artifacts."""
     pdf_path = Path(__file__).parent.parent / "files" / "cie11.pdf"
     chroma_path = Path(__file__).parent.parent / "data" / "indexes" / "chroma"
 
-    print("\n" + "=" * 70)
-    print("📊 RAG PIPELINE VALIDATION")
-    print("=" * 70)
+    sys.stdout.write(_BANNER)
 
     print("\n1️⃣ INGESTION ARTIFACTS")
     print(f"   PDF: {pdf_path.name}")
-    print(f"   • Status: {'✅ EXISTS' if pdf_path.exists() else '❌ MISSING'}")
-    if pdf_path.exists():
-        size = pdf_path.stat().st_size / (1024 * 1024)
+    # One stat call answers both "exists?" and "how big?"
+    try:
+        pdf_stat = os.stat(pdf_path)
+    except FileNotFoundError:
+        pdf_stat = None
+    print(f"   • Status: {'✅ EXISTS' if pdf_stat else '❌ MISSING'}")
+    if pdf_stat:
+        size = pdf_stat.st_size / (1024 * 1024)
         print(f"   • Size: {size:.2f} MB")
 
     print(f"\n   Chroma Index: {chroma_path.name}")
     print(f"   • Status: {'✅ EXISTS' if chroma_path.exists() else '❌ MISSING'}")
     if chroma_path.exists():
-        files = list(chroma_path.glob("*"))
+        # Only names are printed, so scandir avoids a stat per entry
+        with os.scandir(chroma_path) as it:
+            files = [entry.name for entry in it]
         print(f"   • Files: {len(files)}")
-        for f in files:
-            print(f"     - {f.name}")
+        for name in files:
+            print(f"     - {name}")
+
+
+@lru_cache(maxsize=1)
+def _rag_pipeline():
+    """Returns the RAG pipeline, initialising it at most once per run."""
+    from core.retrieval import get_rag_pipeline
+
+    return get_rag_pipeline()
 
 
 def validate_pipeline():
@@ -34,9 +95,7 @@ def validate_pipeline():
     print("\n2️⃣ PIPELINE INITIALIZATION")
 
     try:
-        from core.retrieval import get_rag_pipeline
-
-        pipeline = get_rag_pipeline()
+        pipeline = _rag_pipeline()
 
         if pipeline is None:
             print("   ⚠️  Pipeline returned None (using mock fallback)")
@@ -76,17 +135,25 @@ def validate_agents():
         return False
 
 
+def _compiled_graph():
+    """Builds the LangGraph once per process and returns the cached instance."""
+    global _GRAPH
+    with _GRAPH_LOCK:
+        if _GRAPH is None:
+            from langgraph.checkpoint.memory import MemorySaver
+
+            from core.orchestration.graph import build_graph
+
+            _GRAPH = build_graph(checkpointer=MemorySaver())
+    return _GRAPH
+
+
 def validate_graph():
     """Check if the LangGraph is buildable."""
     print("\n4️⃣ LANGGRAPH ORCHESTRATION")
 
     try:
-        from langgraph.checkpoint.memory import MemorySaver
-
-        from core.orchestration.graph import build_graph
-
-        memory = MemorySaver()
-        build_graph(checkpointer=memory)
+        _compiled_graph()
 
         print("   ✅ LangGraph compiled successfully")
         print("   • Checkpointer: MemorySaver (for interrupts)")
@@ -100,11 +167,22 @@ def validate_graph():
         return False
 
 
+def _check_one(item: tuple[Path, str, str]) -> tuple[str, bool, bool]:
+    """Returns ``(relpath, exists, found)`` for one checklist entry."""
+    base, relpath, component = item
+    fpath = base / relpath
+    if not fpath.exists():
+        return relpath, False, False
+    # Stream line by line so the scan stops at the first match
+    with open(fpath, encoding="utf-8", buffering=1 << 16) as f:
+        return relpath, True, any(component in line for line in f)
+
+
 def validate_endpoints():
     """Check if all key endpoints exist."""
     print("\n5️⃣ IMPLEMENTATION CHECKLIST")
 
-    from pathlib import Path
+    from concurrent.futures import ThreadPoolExecutor
 
     files_to_check = {
         "core/agents/therapist.py": "TherapistAgent",
@@ -116,57 +194,28 @@ def validate_endpoints():
     }
 
     base = Path(__file__).parent.parent
+    items = [(base, relpath, component) for relpath, component in files_to_check.items()]
 
-    for relpath, component in files_to_check.items():
-        fpath = base / relpath
-        if fpath.exists():
-            with open(fpath) as f:
-                content = f.read()
-                if component in content:
-                    print(f"   ✅ {relpath}")
-                    print(f"      └─ {component}")
-                else:
-                    print(f"   ❌ {relpath}")
-                    print(f"      └─ Missing: {component}")
-        else:
+    # Overlap the file I/O; results come back in input order for printing
+    with ThreadPoolExecutor(max_workers=len(items)) as ex:
+        results = list(ex.map(_check_one, items))
+
+    for relpath, exists, found in results:
+        component = files_to_check[relpath]
+        if not exists:
             print(f"   ❌ {relpath} not found")
+        elif found:
+            print(f"   ✅ {relpath}")
+            print(f"      └─ {component}")
+        else:
+            print(f"   ❌ {relpath}")
+            print(f"      └─ Missing: {component}")
 
 
 def show_summary():
     """Show final summary."""
-    print("\n" + "=" * 70)
-    print("PIPELINE READY FOR TESTING")
-    print("=" * 70)
-    print("""
-✅ Status: All components initialized
-   
-To launch the UI:
-   cd /Users/ketcx/pinguino_project/rag-project
-   streamlit run apps/ui/app.py
-
-Workflow:
-   1. Choose language (Español/English)
-   2. Choose mode (Interactive/Auto)
-   3. Start interview
-   4. System will:
-      • Ask therapeutic questions
-      • Monitor for safety risks
-      • Retrieve ICD-11 context via RAG
-      • Generate diagnostic hypotheses
-      • Audit evidence and finalize
-    
-Known limitations:
-   ⚠️  RAG retrieval uses mock fallback (TF-IDF lightweight)
-   ⚠️  Only 30 PDF pages indexed (for speed)
-   ⚠️  DiagnosticianAgent may return hardcoded output if RAG fails
-   
-To index full PDF:
-   python scripts/ingest_pdf_lite.py
-
-To diagnose:
-   python scripts/diagnose_chroma.py
-""")
-    print("=" * 70)
+    sys.stdout.write(_SUMMARY)
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
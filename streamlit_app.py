@@ -2,9 +2,11 @@
 
 Adds the repository root to ``sys.path`` so that all internal imports
 (``core``, ``apps``, ``knowledge``, etc.) resolve correctly without
-requiring an editable install.
+requiring an editable install.  The UI module is imported lazily so that
+importing this file does not pull in the full agent stack.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -13,6 +15,19 @@ _root = Path(__file__).parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from apps.ui.app import main  # noqa: E402
 
-main()
+def _run() -> None:
+    """Imports the UI (and its LLM/RAG stack) only when the app actually runs."""
+    from apps.ui.app import main
+
+    main()
+
+
+# CI smoke checks can set ICD11_EAGER_IMPORT=1 to surface import errors on a
+# plain ``import streamlit_app``.
+if os.environ.get("ICD11_EAGER_IMPORT", "0") == "1":
+    import apps.ui.app  # noqa: F401
+
+# ``streamlit run streamlit_app.py`` executes this file as ``__main__``.
+if __name__ == "__main__":
+    _run()
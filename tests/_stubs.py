@@ -0,0 +1,54 @@
+"""Lightweight test doubles shared by the agent tests."""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+
+class _Call(NamedTuple):
+    """Arguments of the most recent stub call, mirroring ``mock.call_args``."""
+
+    args: tuple
+    kwargs: dict[str, Any]
+
+
+class _StubLLM:
+    """Minimal stand-in for ``llama_cpp.Llama`` used by the agent tests.
+
+    Cheaper than ``MagicMock`` (no attribute auto-creation or call tracking
+    machinery) while keeping the ``call_count`` / ``call_args.kwargs`` shape
+    the tests assert against.
+    """
+
+    __slots__ = ("_resp", "_side", "call_count", "call_args")
+
+    def __init__(self, response: str, side_effect: Iterable | BaseException | None) -> None:
+        self._resp = {"choices": [{"message": {"content": response}}]}
+        if isinstance(side_effect, BaseException):
+            side_effect = itertools.repeat(side_effect)
+        self._side = iter(side_effect) if side_effect is not None else None
+        self.call_count = 0
+        self.call_args: _Call | None = None
+
+    def create_chat_completion(self, *args, **kwargs) -> dict:
+        self.call_count += 1
+        self.call_args = _Call(args, kwargs)
+        if self._side is None:
+            return self._resp
+        result = next(self._side)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+def make_stub_llm(
+    response: str = "", side_effect: Iterable | BaseException | None = None
+) -> _StubLLM:
+    """Returns a stub LLM answering *response*, or successive *side_effect* items.
+
+    As with ``MagicMock.side_effect``, exceptions are raised instead of
+    returned, and a single exception is raised on every call.
+    """
+    return _StubLLM(response, side_effect)
@@ -2,37 +2,50 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 import pytest
 
 
-@pytest.fixture
-def sample_profile() -> dict:
-    """Returns a minimal synthetic client profile."""
-    return {
+def _domains() -> tuple[str, ...]:
+    """Returns TherapistAgent's domain tuple, importing the agent lazily."""
+    from core.agents.therapist import TherapistAgent
+
+    return TherapistAgent.DOMAINS
+
+
+_SAMPLE_PROFILE: Mapping = MappingProxyType(
+    {
         "profile_id": "test_001",
         "demographics": {"name": "Test User", "age": 30, "gender": "non-binary"},
         "presenting_complaints": ["anxiety", "insomnia"],
         "history": "Work-related stress for 3 months.",
         "language": "Español",
     }
+)
+
+
+@pytest.fixture(scope="session")
+def sample_profile() -> Mapping:
+    """Returns a minimal synthetic client profile (read-only, shared per session)."""
+    return _SAMPLE_PROFILE
 
 
 @pytest.fixture
-def base_session_state(sample_profile: dict) -> dict:
+def base_session_state(sample_profile: Mapping) -> dict:
     """Returns a SessionState-compatible dict that mirrors the post-init_session state.
 
     ``domains_pending`` is explicitly populated so that ``coverage_check`` and
     other nodes behave as they would during a real session.
     """
-    from core.agents.therapist import TherapistAgent
-
     return {
         "session_id": "test_session_001",
         "client_profile": sample_profile,
         "transcript": [],
         "messages": [],
         "domains_covered": [],
-        "domains_pending": list(TherapistAgent.DOMAINS),  # all 11 domains pending
+        "domains_pending": list(_domains()),  # all 11 domains pending
         "coverage_complete": False,
         "retrieved_chunks": [],
         "query_history": [],
@@ -2,109 +2,109 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from collections.abc import Mapping
+from types import MappingProxyType
 
 import pytest
 
 from core.agents.auditor import EvidenceAuditorAgent
 from core.agents.prompts import AUDITOR_PROMPT_EN
+from tests._stubs import make_stub_llm
 
 
 def _make_auditor(llm_response: str = "") -> EvidenceAuditorAgent:
-    mock_llm = MagicMock()
-    mock_llm.create_chat_completion.return_value = {
-        "choices": [{"message": {"content": llm_response}}]
-    }
     return EvidenceAuditorAgent(
-        llm=mock_llm,
+        llm=make_stub_llm(llm_response),
         system_prompt=AUDITOR_PROMPT_EN,
         temperature=0.1,
         max_tokens=512,
     )
 
 
-@pytest.fixture
-def state_with_grounded_evidence() -> dict:
-    return {
-        "session_id": "test",
-        "language": "English",
-        "transcript": [
-            {"role": "therapist", "content": "How are you sleeping?"},
-            {"role": "client", "content": "I have been feeling very anxious and unable to sleep."},
-        ],
-        "retrieved_chunks": [
-            {
-                "content": "Generalised Anxiety Disorder 6B00 characterised by excessive anxiety worry",
-                "metadata": {"code": "6B00"},
-            }
-        ],
-        "hypotheses": [
-            {
-                "label": "Generalised Anxiety Disorder",
-                "code": "6B00",
-                "confidence": "HIGH",
-                "evidence_for": ["anxious", "unable to sleep"],
-                "evidence_against": [],
-            }
-        ],
-    }
-
-
-@pytest.fixture
-def state_with_ungrounded_evidence() -> dict:
-    return {
-        "session_id": "test",
-        "language": "English",
-        "transcript": [
-            {"role": "client", "content": "I feel tired."},
-        ],
-        "retrieved_chunks": [{"content": "Some ICD-11 context", "metadata": {}}],
-        "hypotheses": [
-            {
-                "label": "Bipolar Disorder",
-                "code": "6A60",
-                "confidence": "LOW",
-                "evidence_for": ["grandiosity", "racing thoughts", "decreased need for sleep"],
-                "evidence_against": [],
-            }
-        ],
-    }
+@pytest.fixture(scope="module")
+def state_with_grounded_evidence() -> Mapping:
+    return MappingProxyType(
+        {
+            "session_id": "test",
+            "language": "English",
+            "transcript": [
+                {"role": "therapist", "content": "How are you sleeping?"},
+                {
+                    "role": "client",
+                    "content": "I have been feeling very anxious and unable to sleep.",
+                },
+            ],
+            "retrieved_chunks": [
+                {
+                    "content": "Generalised Anxiety Disorder 6B00 characterised by excessive anxiety worry",
+                    "metadata": {"code": "6B00"},
+                }
+            ],
+            "hypotheses": [
+                {
+                    "label": "Generalised Anxiety Disorder",
+                    "code": "6B00",
+                    "confidence": "HIGH",
+                    "evidence_for": ["anxious", "unable to sleep"],
+                    "evidence_against": [],
+                }
+            ],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def state_with_ungrounded_evidence() -> Mapping:
+    return MappingProxyType(
+        {
+            "session_id": "test",
+            "language": "English",
+            "transcript": [
+                {"role": "client", "content": "I feel tired."},
+            ],
+            "retrieved_chunks": [{"content": "Some ICD-11 context", "metadata": {}}],
+            "hypotheses": [
+                {
+                    "label": "Bipolar Disorder",
+                    "code": "6A60",
+                    "confidence": "LOW",
+                    "evidence_for": ["grandiosity", "racing thoughts", "decreased need for sleep"],
+                    "evidence_against": [],
+                }
+            ],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def grounded_report(state_with_grounded_evidence: Mapping) -> dict:
+    return _make_auditor().act(dict(state_with_grounded_evidence))["audit_report"]
+
+
+@pytest.fixture(scope="module")
+def ungrounded_report(state_with_ungrounded_evidence: Mapping) -> dict:
+    return _make_auditor().act(dict(state_with_ungrounded_evidence))["audit_report"]
 
 
 class TestEvidenceAuditor:
-    def test_audit_report_present(self, state_with_grounded_evidence: dict) -> None:
-        auditor = _make_auditor()
-        result = auditor.act(state_with_grounded_evidence)
-        assert "audit_report" in result
-        assert result["audit_report"] is not None
+    def test_audit_report_present(self, grounded_report: dict) -> None:
+        assert grounded_report is not None
 
-    def test_report_has_required_keys(self, state_with_grounded_evidence: dict) -> None:
-        auditor = _make_auditor()
-        result = auditor.act(state_with_grounded_evidence)
-        report = result["audit_report"]
-        for key in ("verified", "traceability_score", "total_claims", "grounded_claims", "issues"):
-            assert key in report
+    @pytest.mark.parametrize(
+        "key", ["verified", "traceability_score", "total_claims", "grounded_claims", "issues"]
+    )
+    def test_report_has_required_keys(self, grounded_report: dict, key: str) -> None:
+        assert key in grounded_report
 
-    def test_grounded_evidence_verified(self, state_with_grounded_evidence: dict) -> None:
-        auditor = _make_auditor()
-        result = auditor.act(state_with_grounded_evidence)
-        report = result["audit_report"]
-        assert report["traceability_score"] > 0.0
+    def test_grounded_evidence_verified(self, grounded_report: dict) -> None:
+        assert grounded_report["traceability_score"] > 0.0
 
-    def test_ungrounded_evidence_produces_issues(
-        self, state_with_ungrounded_evidence: dict
-    ) -> None:
-        auditor = _make_auditor()
-        result = auditor.act(state_with_ungrounded_evidence)
-        report = result["audit_report"]
-        assert len(report["issues"]) > 0
-        assert report["verified"] is False
+    def test_ungrounded_evidence_produces_issues(self, ungrounded_report: dict) -> None:
+        assert len(ungrounded_report["issues"]) > 0
+        assert ungrounded_report["verified"] is False
 
-    def test_traceability_score_between_0_and_1(self, state_with_grounded_evidence: dict) -> None:
-        auditor = _make_auditor()
-        result = auditor.act(state_with_grounded_evidence)
-        score = result["audit_report"]["traceability_score"]
-        assert 0.0 <= score <= 1.0
+    def test_traceability_score_between_0_and_1(self, grounded_report: dict) -> None:
+        assert 0.0 <= grounded_report["traceability_score"] <= 1.0
 
     def test_empty_hypotheses_is_fully_verified(self) -> None:
         auditor = _make_auditor()
@@ -2,36 +2,43 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from types import MappingProxyType
+from typing import Final
 
 from core.agents.client import ClientAgent, _format_profile
 from core.agents.prompts import CLIENT_PROMPT_EN
+from tests._stubs import make_stub_llm
 
 
-def _make_client(llm_response: str = "I feel anxious.") -> ClientAgent:
-    mock_llm = MagicMock()
-    mock_llm.create_chat_completion.return_value = {
-        "choices": [{"message": {"content": llm_response}}]
-    }
-    return ClientAgent(llm=mock_llm, system_prompt=CLIENT_PROMPT_EN)
+def _msg_contains(messages: list[dict], *needles: str) -> bool:
+    """True if any message content contains any of *needles*."""
+    return any(any(n in m["content"] for n in needles) for m in messages)
 
 
-SAMPLE_PROFILE = {
-    "profile_id": "test_anxiety",
-    "demographics": {"name": "Alex", "age": 34, "gender": "non-binary"},
-    "presenting_complaints": ["excessive worry", "insomnia", "restlessness"],
-    "history": "Work-related stress for 6 months.",
-    "language": "English",
-}
+def _make_client(llm_response: str = "I feel anxious.") -> ClientAgent:
+    return ClientAgent(llm=make_stub_llm(llm_response), system_prompt=CLIENT_PROMPT_EN)
+
 
-SAMPLE_TRANSCRIPT = [
+SAMPLE_PROFILE: Final = MappingProxyType(
     {
-        "role": "therapist",
-        "content": "How has your sleep been lately?",
-        "domain": "sleep",
-        "turn_id": 0,
-    },
-]
+        "profile_id": "test_anxiety",
+        "demographics": {"name": "Alex", "age": 34, "gender": "non-binary"},
+        "presenting_complaints": ["excessive worry", "insomnia", "restlessness"],
+        "history": "Work-related stress for 6 months.",
+        "language": "English",
+    }
+)
+
+SAMPLE_TRANSCRIPT: Final = (
+    MappingProxyType(
+        {
+            "role": "therapist",
+            "content": "How has your sleep been lately?",
+            "domain": "sleep",
+            "turn_id": 0,
+        }
+    ),
+)
 
 
 class TestClientAgentProfileInjection:
@@ -44,14 +51,12 @@ class TestClientAgentProfileInjection:
     def test_presenting_complaints_appear_in_messages(self) -> None:
         agent = _make_client()
         messages = agent._build_messages(SAMPLE_TRANSCRIPT, SAMPLE_PROFILE, "English")
-        full_text = " ".join(m["content"] for m in messages)
-        assert "worry" in full_text or "insomnia" in full_text
+        assert _msg_contains(messages, "worry", "insomnia")
 
     def test_history_appears_in_messages(self) -> None:
         agent = _make_client()
         messages = agent._build_messages(SAMPLE_TRANSCRIPT, SAMPLE_PROFILE, "English")
-        full_text = " ".join(m["content"] for m in messages)
-        assert "stress" in full_text or "months" in full_text
+        assert _msg_contains(messages, "stress", "months")
 
     def test_empty_profile_does_not_crash(self) -> None:
         agent = _make_client()
@@ -62,8 +67,7 @@ class TestClientAgentProfileInjection:
     def test_transcript_history_included(self) -> None:
         agent = _make_client()
         messages = agent._build_messages(SAMPLE_TRANSCRIPT, SAMPLE_PROFILE, "English")
-        full_text = " ".join(m["content"] for m in messages)
-        assert "sleep" in full_text
+        assert _msg_contains(messages, "sleep")
 
     def test_final_instruction_is_last_message(self) -> None:
         agent = _make_client()
@@ -75,9 +79,9 @@ class TestClientAgentProfileInjection:
     def test_profile_context_is_first_message(self) -> None:
         agent = _make_client()
         messages = agent._build_messages(SAMPLE_TRANSCRIPT, SAMPLE_PROFILE, "English")
-        # With a non-empty profile, the first message should carry profile context
-        first_user = next(m for m in messages if m["role"] == "user")
-        assert "Alex" in first_user["content"]
+        # With a non-empty profile, _build_messages always puts the profile first
+        assert messages[0]["role"] == "user"
+        assert "Alex" in messages[0]["content"]
 
     def test_spanish_instruction_in_spanish_mode(self) -> None:
         agent = _make_client()
@@ -149,6 +153,13 @@ class TestMockResponseVariety:
         questions = {d: _mock_therapist_question(d, "English") for d in domains}
         assert len(set(questions.values())) == len(domains)
 
+    def test_mock_banks_are_static_tuples(self) -> None:
+        from core.orchestration import nodes
+
+        for bank in (nodes._MOCK_CLIENT_ES, nodes._MOCK_CLIENT_EN):
+            assert all(isinstance(options, tuple) for options in bank.values())
+        assert nodes._mock_client_response("mood", "Español") in nodes._MOCK_CLIENT_ES["mood"]
+
     def test_same_domain_can_return_different_responses(self) -> None:
         """Multiple calls for the same domain may return different options."""
         from core.orchestration.nodes import _mock_client_response
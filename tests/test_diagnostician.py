@@ -2,31 +2,35 @@
 
 from __future__ import annotations
 
+import functools
 import json
-from unittest.mock import MagicMock
+import re
 
 import pytest
 
 from core.agents.diagnostician import DiagnosticianAgent
 from core.agents.prompts import DIAGNOSTICIAN_PROMPT_EN
+from tests._stubs import make_stub_llm
 
 
+@functools.cache
 def _make_agent(llm_response: str) -> DiagnosticianAgent:
-    """Returns a DiagnosticianAgent whose LLM always returns *llm_response*."""
-    mock_llm = MagicMock()
-    mock_llm.create_chat_completion.return_value = {
-        "choices": [{"message": {"content": llm_response}}]
-    }
+    """Returns a DiagnosticianAgent whose LLM always returns *llm_response*.
+
+    Agents are cached per response; ``act()`` only reads its state argument,
+    so sharing one between tests is safe.
+    """
     return DiagnosticianAgent(
-        llm=mock_llm,
+        llm=make_stub_llm(llm_response),
         system_prompt=DIAGNOSTICIAN_PROMPT_EN,
         temperature=0.3,
         max_tokens=1024,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def minimal_state() -> dict:
+    # Shared across the module: tests shallow-copy it and only rebind top-level keys
     return {
         "session_id": "test",
         "transcript": [
@@ -104,6 +108,11 @@ class TestDiagnosticianJSONParsing:
         result = agent.act(dict(minimal_state))
         assert result["hypotheses"][0]["code"] == "6B00"
 
+    def test_trailing_comma_regex_is_precompiled(self) -> None:
+        import core.agents.diagnostician as d
+
+        assert isinstance(d._TRAILING_COMMA_RE, re.Pattern)
+
     def test_single_object_wrapped_in_list(self, minimal_state: dict) -> None:
         raw = json.dumps(
             {
@@ -0,0 +1,48 @@
+"""Tests for the shared embedding model accessor."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator
+from types import ModuleType
+from unittest.mock import MagicMock
+
+import pytest
+
+from core import embeddings as embeddings_module
+from core.embeddings import get_embeddings
+
+
+@pytest.fixture
+def fake_hf(monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
+    """Replaces HuggingFaceEmbeddings with a mock and clears the accessor cache."""
+    hf_cls = MagicMock()
+    module = ModuleType("langchain_community.embeddings")
+    module.HuggingFaceEmbeddings = hf_cls  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "langchain_community.embeddings", module)
+    embeddings_module._load_embeddings.cache_clear()
+    yield hf_cls
+    embeddings_module._load_embeddings.cache_clear()
+
+
+class TestGetEmbeddings:
+    def test_same_instance_returned(self, fake_hf: MagicMock) -> None:
+        first = get_embeddings("some/model", "cpu")
+        second = get_embeddings("some/model", "cpu")
+        assert first is second
+        fake_hf.assert_called_once()
+
+    def test_model_is_warmed_up(self, fake_hf: MagicMock) -> None:
+        embeddings = get_embeddings("some/model", "cpu")
+        embeddings.embed_query.assert_called_once()
+
+    def test_device_omitted_when_none(self, fake_hf: MagicMock) -> None:
+        get_embeddings("some/model")
+        assert fake_hf.call_args.kwargs["model_kwargs"] == {}
+
+    def test_devices_do_not_evict_each_other(self, fake_hf: MagicMock) -> None:
+        default = get_embeddings("some/model")
+        mps = get_embeddings("some/model", device="mps")
+        assert get_embeddings("some/model", None) is default
+        assert get_embeddings("some/model", "mps") is mps
+        assert fake_hf.call_count == 2
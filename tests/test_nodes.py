@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from core.orchestration.nodes import coverage_check, init_session, risk_check
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from core.orchestration import nodes
+from core.orchestration.nodes import coverage_check, init_session, risk_check, therapist_ask
+
+
+def _state(base: dict, **over) -> dict:
+    """Returns a copy of *base* with *over* applied, in a single dict build."""
+    return {**base, **over}
 
 
 class TestInitSession:
@@ -27,26 +38,32 @@ class TestInitSession:
         """Running init_session multiple times should produce different domain orders."""
         orders = set()
         for _ in range(20):
-            state = dict(base_session_state)
-            state["domains_pending"] = []  # force fresh shuffle each time
+            # Empty domains_pending forces a fresh shuffle each time
+            state = _state(base_session_state, domains_pending=[])
             result = init_session(state)
             orders.add(tuple(result["domains_pending"]))
         # With 11 domains, the chance of all 20 runs being identical is astronomically small
         assert len(orders) > 1, "Domain order should vary across sessions"
 
+    def test_same_seed_reproduces_order(self, base_session_state: dict) -> None:
+        """The same global seed (``main.py run --seed``) yields the same order."""
+        state = _state(base_session_state, domains_pending=[])
+        random.seed(42)
+        first = init_session(state)["domains_pending"]
+        random.seed(42)
+        assert init_session(state)["domains_pending"] == first
+
     def test_all_domains_present_after_shuffle(self, base_session_state: dict) -> None:
         from core.agents.therapist import TherapistAgent
 
-        state = dict(base_session_state)
-        state["domains_pending"] = []
+        state = _state(base_session_state, domains_pending=[])
         result = init_session(state)
         assert set(result["domains_pending"]) == set(TherapistAgent.DOMAINS)
 
     def test_existing_domains_pending_not_reshuffled(self, base_session_state: dict) -> None:
         """If domains_pending is already set (resume), do not reshuffle."""
         original_order = ["sleep", "mood", "anxiety"]
-        state = dict(base_session_state)
-        state["domains_pending"] = original_order
+        state = _state(base_session_state, domains_pending=original_order)
         result = init_session(state)
         assert result["domains_pending"] == original_order
 
@@ -60,73 +77,136 @@ class TestCoverageCheck:
     def test_complete_when_all_domains_in_transcript(self, base_session_state: dict) -> None:
         from core.agents.therapist import TherapistAgent
 
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "therapist", "content": "Q", "domain": d, "turn_id": i}
-            for i, d in enumerate(TherapistAgent.DOMAINS)
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[
+                {"role": "therapist", "content": "Q", "domain": d, "turn_id": i}
+                for i, d in enumerate(TherapistAgent.DOMAINS)
+            ],
+        )
         result = coverage_check(state)
         assert result["coverage_complete"] is True
         assert result["domains_pending"] == []
 
     def test_complete_when_max_turns_reached(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["turn_count"] = 40
-        state["max_turns"] = 40
+        state = _state(base_session_state, turn_count=40, max_turns=40)
         result = coverage_check(state)
         assert result["coverage_complete"] is True
 
+    def test_ceiling_derives_covered_from_transcript(self, base_session_state: dict) -> None:
+        state = _state(
+            base_session_state,
+            turn_count=40,
+            max_turns=40,
+            transcript=[{"role": "therapist", "content": "Q", "domain": "mood", "turn_id": 0}],
+        )
+        result = coverage_check(state)
+        assert result["domains_covered"] == ["mood"]
+        assert "mood" not in result["domains_pending"]
+
     def test_domains_derived_from_transcript(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "therapist", "content": "Q", "domain": "mood", "turn_id": 0},
-            {"role": "therapist", "content": "Q", "domain": "anxiety", "turn_id": 1},
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[
+                {"role": "therapist", "content": "Q", "domain": "mood", "turn_id": 0},
+                {"role": "therapist", "content": "Q", "domain": "anxiety", "turn_id": 1},
+            ],
+        )
         result = coverage_check(state)
         assert "mood" in result["domains_covered"]
         assert "anxiety" in result["domains_covered"]
 
+    def test_stored_domains_used_without_rescanning(
+        self, base_session_state: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def _fail(transcript):
+            raise AssertionError("transcript rescanned")
+
+        monkeypatch.setattr(nodes, "_domains_in", _fail)
+        state = _state(
+            base_session_state,
+            domains_covered=["mood"],
+            transcript=[{"role": "therapist", "content": "Q", "domain": "mood", "turn_id": 0}],
+        )
+        result = coverage_check(state)
+        assert result["domains_covered"] == ["mood"]
+        assert "mood" not in result["domains_pending"]
+
+
+class TestTherapistAsk:
+    def test_asked_domain_marked_covered(
+        self, base_session_state: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(nodes, "AGENTS", {})
+        state = _state(base_session_state, transcript=[], domains_pending=["sleep", "mood"])
+        result = therapist_ask(state)
+        assert result["domains_covered"] == ["sleep"]
+
+        state.update(result)
+        assert coverage_check(state)["domains_pending"] == ["mood"]
+
+    def test_agent_turn_without_transcript(
+        self, base_session_state: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        agent = SimpleNamespace(act=lambda state: {"transcript": []})
+        monkeypatch.setattr(nodes, "AGENTS", {"therapist": agent})
+        result = therapist_ask(_state(base_session_state, domains_covered=["mood"]))
+        assert result["domains_covered"] == ["mood"]
+
 
 class TestRiskCheck:
     def test_safe_text_returns_no_risk(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "client", "content": "Me siento un poco cansado hoy.", "turn_id": 0}
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[
+                {"role": "client", "content": "Me siento un poco cansado hoy.", "turn_id": 0}
+            ],
+        )
         result = risk_check(state)
         assert result["risk_detected"] is False
         assert result["risk_type"] is None
 
     def test_risky_spanish_text_detected(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "client", "content": "He pensado en suicidarme.", "turn_id": 0}
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[{"role": "client", "content": "He pensado en suicidarme.", "turn_id": 0}],
+        )
         result = risk_check(state)
         assert result["risk_detected"] is True
         assert result["risk_type"] is not None
 
     def test_risky_english_text_detected(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "client", "content": "I want to kill myself.", "turn_id": 0}
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[{"role": "client", "content": "I want to kill myself.", "turn_id": 0}],
+        )
         result = risk_check(state)
         assert result["risk_detected"] is True
 
     def test_empty_transcript_is_safe(self, base_session_state: dict) -> None:
-        state = dict(base_session_state)
-        state["transcript"] = []
+        state = _state(base_session_state, transcript=[])
         result = risk_check(state)
         assert result["risk_detected"] is False
 
+    @pytest.mark.parametrize("transcript", [None, "missing"])
+    def test_absent_transcript_is_safe(self, base_session_state: dict, transcript) -> None:
+        state = _state(base_session_state, transcript=transcript)
+        if transcript == "missing":
+            del state["transcript"]
+        assert risk_check(state) == {"risk_detected": False, "risk_type": None}
+
     def test_only_last_turn_checked(self, base_session_state: dict) -> None:
         """Historical risky turns should not re-trigger; only the latest matters."""
-        state = dict(base_session_state)
-        state["transcript"] = [
-            {"role": "client", "content": "He pensado en suicidarme.", "turn_id": 0},
-            {"role": "client", "content": "Gracias por la ayuda.", "turn_id": 1},
-        ]
+        state = _state(
+            base_session_state,
+            transcript=[
+                {"role": "client", "content": "He pensado en suicidarme.", "turn_id": 0},
+                {"role": "client", "content": "Gracias por la ayuda.", "turn_id": 1},
+            ],
+        )
         result = risk_check(state)
         # Last turn is safe
         assert result["risk_detected"] is False
+
+    def test_gate_shared_across_calls(self) -> None:
+        assert nodes._risk_gate() is nodes._risk_gate()
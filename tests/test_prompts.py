@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from core.agents import prompts
 from core.agents.prompts import (
     THERAPIST_PROMPT,  # backward-compat alias
     get_auditor_prompt,
@@ -53,3 +54,8 @@ class TestPromptSelectors:
         """THERAPIST_PROMPT constant must still exist (backward compatibility)."""
         assert THERAPIST_PROMPT is not None
         assert len(THERAPIST_PROMPT) > 0
+
+    def test_prompts_are_module_constants(self) -> None:
+        for name in ("THERAPIST", "CLIENT", "DIAGNOSTICIAN", "AUDITOR", "RAPPORT"):
+            for lang in ("EN", "ES"):
+                assert isinstance(getattr(prompts, f"{name}_PROMPT_{lang}"), str)
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import numpy as np
+import pytest
+
 from core.retrieval.query_builder import QueryBuilder
 from core.retrieval.retrievers import HybridRetriever
 
@@ -12,20 +16,22 @@ from core.retrieval.retrievers import HybridRetriever
 # ---------------------------------------------------------------------------
 
 
-def _make_chroma_doc(content: str, code: str | None = None) -> MagicMock:
-    doc = MagicMock()
-    doc.page_content = content
-    doc.metadata = {"code": code} if code else {}
-    return doc
+def _make_chroma_doc(content: str, code: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(page_content=content, metadata={"code": code} if code else {})
 
 
-def _make_retriever(dense_docs: list, bm25_corpus: list) -> HybridRetriever:
-    """Creates a HybridRetriever with a mocked Chroma vectorstore."""
-    mock_store = MagicMock()
-    mock_store.similarity_search_with_score.return_value = [
+def _dense_result(dense_docs: list) -> list[tuple[SimpleNamespace, float]]:
+    """Builds ``similarity_search_with_score`` output for *dense_docs*."""
+    return [
         (_make_chroma_doc(d["content"], d.get("code")), 0.9 - i * 0.05)
         for i, d in enumerate(dense_docs)
     ]
+
+
+def _make_retriever(dense_result: list, bm25_corpus: list) -> HybridRetriever:
+    """Creates a HybridRetriever whose mocked Chroma store returns *dense_result*."""
+    mock_store = MagicMock()
+    mock_store.similarity_search_with_score.return_value = dense_result
     return HybridRetriever(mock_store, bm25_corpus, top_k_dense=4, top_k_bm25=4, top_k_final=3)
 
 
@@ -66,57 +72,127 @@ DENSE_DOCS = [
     {"content": "General background text without a specific code", "code": None},
 ]
 
+# Built once; the fusion code only reads these
+_DENSE_MOCK_RESULT = _dense_result(DENSE_DOCS)
+
+
+@pytest.fixture(scope="module")
+def retriever() -> HybridRetriever:
+    """Shared retriever over the standard corpora; BM25 is indexed once per module."""
+    return _make_retriever(_DENSE_MOCK_RESULT, BM25_CORPUS)
+
+
+@pytest.fixture(scope="module")
+def qb() -> QueryBuilder:
+    return QueryBuilder()
+
 
 class TestHybridRetrieverRRF:
-    def test_retrieve_returns_list(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_retrieve_returns_list(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("anxiety worry")
         assert isinstance(results, list)
 
-    def test_retrieve_respects_top_k_final(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_retrieve_respects_top_k_final(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("anxiety")
         assert len(results) <= 3  # top_k_final=3
 
-    def test_results_have_required_keys(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_results_have_required_keys(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("mood")
         for chunk in results:
             assert "content" in chunk
             assert "metadata" in chunk
             assert "score" in chunk
 
-    def test_chunks_with_icd_code_prioritised(self) -> None:
+    def test_chunks_with_icd_code_prioritised(self, retriever: HybridRetriever) -> None:
         """Documents with an ICD code in metadata should rank first."""
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
         results = retriever.retrieve("mood disorder anxiety")
         if len(results) >= 2:
             # At least the first result should have a code
             codes_present = [bool(r["metadata"].get("code")) for r in results[:2]]
             assert any(codes_present)
 
-    def test_rrf_scores_are_positive(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_rrf_scores_are_positive(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("anxiety sleep")
         for r in results:
             assert r["score"] > 0
 
-    def test_no_duplicate_content(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_no_duplicate_content(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("anxiety depression")
         contents = [r["content"] for r in results]
         assert len(contents) == len(set(contents))
 
-    def test_source_field_set(self) -> None:
-        retriever = _make_retriever(DENSE_DOCS, BM25_CORPUS)
+    def test_shared_content_merged_into_one_hybrid_entry(self) -> None:
+        retriever = _make_retriever(_DENSE_MOCK_RESULT[:1], BM25_CORPUS)
+        dense = retriever._dense_search("anxiety", None)
+        results = retriever._rrf_fusion(dense, [(1, 2.0), (1, 1.0)])
+        assert len(results) == 1
+        assert results[0]["source"] == "hybrid"
+        assert results[0]["score"] == round(1 / 61 + 1 / 61 + 1 / 62, 6)
+
+    def test_source_field_set(self, retriever: HybridRetriever) -> None:
         results = retriever.retrieve("trauma")
         for r in results:
             assert r["source"] in ("dense", "bm25", "hybrid")
 
 
+class TestBM25Scoring:
+    def test_matching_document_scores_highest(self, retriever: HybridRetriever) -> None:
+        scores = retriever._bm25_scores("difficulty maintaining sleep")
+        assert len(scores) == len(BM25_CORPUS)
+        assert int(scores.argmax()) == 2
+
+    def test_corpus_indexed_once(
+        self, retriever: HybridRetriever, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from core.retrieval import retrievers
+
+        def _fail(*_args, **_kwargs):
+            raise AssertionError("BM25 index rebuilt at query time")
+
+        monkeypatch.setattr(retrievers, "_build_bm25_matrix", _fail)
+        assert retriever.retrieve("anxiety worry")
+
+    def test_unknown_terms_score_zero(self, retriever: HybridRetriever) -> None:
+        scores = retriever._bm25_scores("xylophone")
+        assert not scores.any()
+
+
+class TestBM25Persistence:
+    def test_save_load_round_trip(self, retriever: HybridRetriever, tmp_path) -> None:
+        retriever.save(tmp_path)
+        loaded = HybridRetriever.load(tmp_path, MagicMock(), top_k_final=3)
+
+        for query in ("anxiety worry", "sleep", "unknownterm"):
+            assert np.allclose(retriever._bm25_scores(query), loaded._bm25_scores(query))
+        assert loaded.bm25_docs == BM25_CORPUS
+        assert loaded.top_k_final == 3
+
+    def test_loaded_arrays_are_memory_mapped(self, retriever: HybridRetriever, tmp_path) -> None:
+        retriever.save(tmp_path)
+        loaded = HybridRetriever.load(tmp_path, MagicMock())
+        assert not loaded._bm25_matrix.data.flags.writeable
+
+    @pytest.mark.parametrize("stamp", [None, '{"format_version": 1}'])
+    def test_outdated_index_rebuilt_from_corpus(
+        self, retriever: HybridRetriever, tmp_path, stamp: str | None
+    ) -> None:
+        from core.retrieval.retrievers import BM25_META_FILE
+
+        retriever.save(tmp_path)
+        meta = tmp_path / BM25_META_FILE
+        if stamp is None:
+            meta.unlink()
+        else:
+            meta.write_text(stamp)
+        (tmp_path / "vocab.npy").unlink()  # stale arrays must not be read
+
+        loaded = HybridRetriever.load(tmp_path, MagicMock())
+        assert np.allclose(retriever._bm25_scores("anxiety"), loaded._bm25_scores("anxiety"))
+        assert loaded._bm25_matrix.data.flags.writeable
+
+
 class TestQueryBuilder:
-    def test_returns_dict_with_semantic_key(self) -> None:
-        qb = QueryBuilder()
+    def test_returns_dict_with_semantic_key(self, qb: QueryBuilder) -> None:
         transcript = [
             {"role": "therapist", "content": "How are you feeling?"},
             {"role": "client", "content": "Very anxious and struggling to sleep."},
@@ -124,14 +200,106 @@ class TestQueryBuilder:
         result = qb.build_queries(transcript)
         assert "semantic" in result
 
-    def test_semantic_query_non_empty(self) -> None:
-        qb = QueryBuilder()
+    def test_semantic_query_non_empty(self, qb: QueryBuilder) -> None:
         transcript = [{"role": "client", "content": "I feel extremely anxious"}]
         result = qb.build_queries(transcript)
         assert result["semantic"]
 
-    def test_empty_transcript_returns_defaults(self) -> None:
-        qb = QueryBuilder()
+    def test_empty_transcript_returns_defaults(self, qb: QueryBuilder) -> None:
         result = qb.build_queries([])
         assert isinstance(result, dict)
         assert "semantic" in result
+
+
+class TestQueryCaching:
+    def test_tokenize_is_cached(self) -> None:
+        from core.retrieval.retrievers import _tokenize
+
+        assert _tokenize("Anxiety Worry") == ("anxiety", "worry")
+        assert _tokenize("Anxiety Worry") is _tokenize("Anxiety Worry")
+
+    def test_tokenize_drops_punctuation_and_casefolds(self) -> None:
+        from core.retrieval.retrievers import _tokenize
+
+        assert _tokenize("Ansiedad, ICD-11 (6B00)!") == ("ansiedad", "icd", "11", "6b00")
+        assert _tokenize("STRASSE") == _tokenize("Straße")
+
+    def test_query_embedding_computed_once(self) -> None:
+        from core.retrieval import CachedQueryEmbeddings
+
+        base = MagicMock()
+        base.embed_query.return_value = [0.1, 0.2]
+        embeddings = CachedQueryEmbeddings(base)
+        assert embeddings.embed_query("anxiety") == [0.1, 0.2]
+        assert embeddings.embed_query("anxiety") == [0.1, 0.2]
+        base.embed_query.assert_called_once_with("anxiety")
+
+    def test_query_embedding_cache_evicts_oldest(self) -> None:
+        from core.retrieval import CachedQueryEmbeddings
+
+        base = MagicMock()
+        base.embed_query.side_effect = lambda text: [float(len(text))]
+        embeddings = CachedQueryEmbeddings(base, maxsize=2)
+        for text in ("a", "bb", "ccc", "a"):
+            embeddings.embed_query(text)
+        assert base.embed_query.call_count == 4
+
+
+class TestFaissDenseSearch:
+    def test_unfiltered_query_served_from_faiss(self) -> None:
+        faiss = pytest.importorskip("faiss")
+        from langchain_core.documents import Document
+
+        vectors = np.eye(3, dtype=np.float32)
+        index = faiss.IndexFlatIP(3)
+        index.add(vectors)
+        docs = [Document(page_content=d["content"], metadata={}) for d in BM25_CORPUS[:3]]
+
+        mock_store = MagicMock()
+        query_model = MagicMock()
+        query_model.embed_query.return_value = [0.0, 1.0, 0.0]
+        retriever = HybridRetriever(
+            mock_store,
+            BM25_CORPUS,
+            faiss_index=index,
+            faiss_docs=docs,
+            faiss_embeddings=query_model,
+        )
+        results = retriever._dense_search("anxiety", None)
+
+        assert results[0][0].page_content == BM25_CORPUS[1]["content"]
+        query_model.embed_query.assert_called_once_with("anxiety")
+        mock_store.embeddings.embed_query.assert_not_called()
+        mock_store.similarity_search_with_score.assert_not_called()
+
+    def test_index_without_query_model_uses_chroma(self) -> None:
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score.return_value = []
+        retriever = HybridRetriever(mock_store, BM25_CORPUS, faiss_index=SimpleNamespace())
+        retriever._dense_search("anxiety", None)
+        mock_store.similarity_search_with_score.assert_called_once()
+
+    def test_load_returns_embedding_model(self, tmp_path) -> None:
+        faiss = pytest.importorskip("faiss")
+        from core.retrieval.retrievers import (
+            FAISS_DOCS_FILE,
+            FAISS_INDEX_FILE,
+            FAISS_META_FILE,
+            load_faiss_index,
+        )
+
+        faiss.write_index(faiss.IndexFlatIP(3), str(tmp_path / FAISS_INDEX_FILE))
+        (tmp_path / FAISS_DOCS_FILE).write_text("[]", encoding="utf-8")
+        assert load_faiss_index(tmp_path) is None
+
+        (tmp_path / FAISS_META_FILE).write_text('{"embedding_model": "some/model"}')
+        _index, docs, model = load_faiss_index(tmp_path)
+        assert docs == []
+        assert model == "some/model"
+
+    def test_filtered_query_falls_back_to_chroma(self) -> None:
+        mock_store = MagicMock()
+        mock_store.similarity_search_with_score.return_value = []
+        retriever = HybridRetriever(mock_store, BM25_CORPUS, faiss_index=SimpleNamespace())
+        retriever._dense_search("anxiety", {"code": "6B00"})
+        mock_store.similarity_search_with_score.assert_called_once()
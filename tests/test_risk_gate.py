@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import pytest
 
+from core.safety import risk_gate
 from core.safety.risk_gate import RiskGate
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gate() -> RiskGate:
     return RiskGate()
 
@@ -76,3 +77,45 @@ class TestRiskGateSafeResponse:
         response = gate.get_safe_response("suicidio")
         # Should mention an emergency contact or number
         assert any(char.isdigit() for char in response)
+
+    def test_safe_response_built_once_per_risk_type(self, gate: RiskGate) -> None:
+        first = gate.get_safe_response("Riesgo de Autolesión")
+        assert gate.get_safe_response("Riesgo de Autolesión") is first
+        assert "Riesgo de Autolesión" in first
+
+
+_SAMPLES = [
+    "Estoy pensando en el SUICIDIO",
+    "Quiero hacerme DAÑO",
+    "I want to kill myself",
+    "thoughts of self.harm",
+    "I want to kill myſelf",
+    "ſuicidio",
+    "Me siento un poco triste y cansado.",
+    "",
+]
+
+
+class TestRiskGateMatchers:
+    def test_automaton_used_when_available(self) -> None:
+        pytest.importorskip("ahocorasick")
+        assert risk_gate._keyword_automaton() is not None
+
+    @pytest.mark.parametrize("text", _SAMPLES)
+    def test_fallback_matches_automaton(
+        self, gate: RiskGate, text: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        expected = gate.check(text)
+        monkeypatch.setattr(risk_gate, "_keyword_automaton", lambda: None)
+        assert gate.check(text) == expected
+
+    @pytest.mark.parametrize("keyword", list(risk_gate.RISK_PATTERNS))
+    def test_every_keyword_maps_to_its_risk_type(self, gate: RiskGate, keyword: str) -> None:
+        assert gate.check(f"... {keyword.upper()} ...") == (True, risk_gate.RISK_PATTERNS[keyword])
+
+    @pytest.mark.parametrize("text", ["I want to kill myſelf", "ſuicidio"])
+    def test_fallback_handles_unicode_case_variants(
+        self, gate: RiskGate, text: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(risk_gate, "_keyword_automaton", lambda: None)
+        assert gate.check(text) == (True, risk_gate._SELF_HARM)